@@ -1,62 +1,217 @@
-import importlib.util
+import importlib.machinery
+import os
 import sys
-import time
+import types
 from pathlib import Path
 
-from PyQt6 import QtWidgets, QtCore
-from watchdog.events import FileSystemEventHandler
-from watchdog.observers import Observer
+from PyQt6 import QtWidgets, QtCore, sip, uic
 
-from .utils import check_dependencies
+from .utils import check_dependencies_in_venv
 
+# Compiled .ui classes, keyed by absolute .ui path -> (file stamp, (form_class, base_class))
+_UI_CLASS_CACHE = {}
+# Compiled module code, keyed by source path -> (file stamp, code object)
+_CODE_CACHE = {}
 
-class ElementTree(QtWidgets.QTreeWidget):
+_original_load_ui_type = uic.loadUiType
+
+
+def _file_stamp(path):
+    # Size as well as nanosecond mtime, so a second save within one coarse
+    # filesystem timestamp tick still invalidates the cache
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _cached_load_ui_type(uifile, *args, **kwargs):
+    """Drop-in for uic.loadUiType that skips recompiling unchanged .ui files"""
+    if not isinstance(uifile, (str, os.PathLike)):
+        return _original_load_ui_type(uifile, *args, **kwargs)
+
+    ui_path = os.path.abspath(uifile)
+    stamp = _file_stamp(ui_path)
+    cached = _UI_CLASS_CACHE.get(ui_path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    ui_classes = _original_load_ui_type(uifile, *args, **kwargs)
+    _UI_CLASS_CACHE[ui_path] = (stamp, ui_classes)
+    return ui_classes
+
+
+def _compile_module(path):
+    """Return the code object for path, reusing it while the file is unchanged"""
+    stamp = _file_stamp(path)
+    cached = _CODE_CACHE.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    with open(path, 'rb') as f:
+        code = compile(f.read(), path, 'exec')
+    _CODE_CACHE[path] = (stamp, code)
+    return code
+
+
+class WidgetTreeModel(QtCore.QAbstractItemModel):
+    """Exposes a widget hierarchy to a view, reading children only when asked"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._root_widget = None
+        self._children = {}  # id(widget) -> direct child widgets
+        self._parents = {}  # id(widget) -> parent widget
+        self._rows = {}  # id(widget) -> row within its parent
+
+    def set_root(self, window):
+        self.beginResetModel()
+        self._root_widget = window
+        self._children = {}
+        self._parents = {}
+        self._rows = {}
+        self.endResetModel()
+
+    def child_widgets(self, widget):
+        key = id(widget)
+        children = self._children.get(key)
+        if children is None:
+            if sip.isdeleted(widget):
+                children = []
+            else:
+                # One children() call, filtered here, is cheaper under PyQt6
+                # than findChildren's per-call binding overhead
+                children = [child for child in widget.children() if isinstance(child, QtWidgets.QWidget)]
+            self._children[key] = children
+            for row, child in enumerate(children):
+                self._parents[id(child)] = widget
+                self._rows[id(child)] = row
+        return children
+
+    def widget_for_index(self, index):
+        if not index.isValid():
+            return None
+        return index.internalPointer()
+
+    def index_for_widget(self, widget):
+        if widget is None:
+            return QtCore.QModelIndex()
+        if widget is self._root_widget:
+            return self.createIndex(0, 0, widget)
+        row = self._rows.get(id(widget))
+        if row is None:
+            return QtCore.QModelIndex()
+        return self.createIndex(row, 0, widget)
+
+    def refresh_widget(self, widget):
+        index = self.index_for_widget(widget)
+        if index.isValid():
+            self.dataChanged.emit(index, index, [QtCore.Qt.ItemDataRole.DisplayRole])
+
+    @staticmethod
+    def display_name(widget):
+        # Create readable widget name
+        widget_name = widget.__class__.__name__
+        object_name = widget.objectName()
+        if object_name:
+            return f"{widget_name} ({object_name})"
+        return widget_name
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QtCore.QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row, column, self._root_widget)
+        return self.createIndex(row, column, self.child_widgets(parent.internalPointer())[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QtCore.QModelIndex()
+        widget = index.internalPointer()
+        if widget is self._root_widget:
+            return QtCore.QModelIndex()
+        return self.index_for_widget(self._parents.get(id(widget)))
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        if not parent.isValid():
+            return 1 if self._root_widget is not None else 0
+        return len(self.child_widgets(parent.internalPointer()))
+
+    def hasChildren(self, parent=QtCore.QModelIndex()):
+        # Shares the cached child list with rowCount, so each widget's
+        # children are read from Qt at most once per populate
+        if parent.column() > 0:
+            return False
+        if not parent.isValid():
+            return self._root_widget is not None
+        return bool(self.child_widgets(parent.internalPointer()))
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 1
+
+    def data(self, index, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != QtCore.Qt.ItemDataRole.DisplayRole:
+            return None
+        widget = index.internalPointer()
+        if sip.isdeleted(widget):
+            return None
+        if widget is self._root_widget:
+            return widget.__class__.__name__
+        return self.display_name(widget)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if orientation == QtCore.Qt.Orientation.Horizontal and role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return "UI Elements"
+        return None
+
+
+class ElementTree(QtWidgets.QTreeView):
     element_selected = QtCore.pyqtSignal(QtWidgets.QWidget)
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.widget_model = WidgetTreeModel(self)
+        self.setModel(self.widget_model)
         self.setup_ui()
 
     def setup_ui(self):
-        # Set up tree widget
-        self.setHeaderLabel("UI Elements")
-        self.setColumnCount(1)
+        # Set up tree view
         self.setHeaderHidden(False)
         self.setUniformRowHeights(True)
         self.setAnimated(True)
         self.setIndentation(20)
 
         # Connect signals
-        self.itemClicked.connect(self.on_item_clicked)
+        self.selectionModel().currentChanged.connect(self.on_current_changed)
 
         # Style the tree
         self.setStyleSheet("""
-            QTreeWidget {
+            QTreeView {
                 border: 1px solid #ddd;
                 border-radius: 4px;
                 background-color: white;
             }
-            QTreeWidget::item {
+            QTreeView::item {
                 padding: 6px;
                 border-radius: 2px;
             }
-            QTreeWidget::item:hover {
+            QTreeView::item:hover {
                 background-color: #f0f0f0;
             }
-            QTreeWidget::item:selected {
+            QTreeView::item:selected {
                 background-color: #4a90e2;
                 color: white;
             }
-            QTreeWidget::branch {
+            QTreeView::branch {
                 background-color: white;
             }
-            QTreeWidget::branch:has-siblings:!adjoins-item {
+            QTreeView::branch:has-siblings:!adjoins-item {
                 border-image: url(vline.png) 0;
             }
-            QTreeWidget::branch:has-siblings:adjoins-item {
+            QTreeView::branch:has-siblings:adjoins-item {
                 border-image: url(branch-more.png) 0;
             }
-            QTreeWidget::branch:!has-children:!has-siblings:adjoins-item {
+            QTreeView::branch:!has-children:!has-siblings:adjoins-item {
                 border-image: url(branch-end.png) 0;
             }
             QHeaderView::section {
@@ -70,40 +225,34 @@ class ElementTree(QtWidgets.QTreeWidget):
         """)
 
     def populate_tree(self, window):
-        self.clear()
-        self.widget_map = {}
-
-        if not window:
-            return
-
-        root = QtWidgets.QTreeWidgetItem(self, [f"{window.__class__.__name__}"])
-        self.widget_map[id(root)] = window
-        self.add_widgets(window, root)
-        self.expandAll()
-
-    def add_widgets(self, parent_widget, parent_item):
-        for child in parent_widget.findChildren(QtWidgets.QWidget,
-                                                options=QtCore.Qt.FindChildOption.FindDirectChildrenOnly):
-            # Create readable widget name
-            widget_name = child.__class__.__name__
-            object_name = child.objectName()
-            if object_name:
-                display_name = f"{widget_name} ({object_name})"
-            else:
-                display_name = widget_name
-
-            item = QtWidgets.QTreeWidgetItem(parent_item, [display_name])
-            self.widget_map[id(item)] = child
-            self.add_widgets(child, item)
-
-    def on_item_clicked(self, item):
-        widget = self.widget_map.get(id(item))
-        if widget:
+        # Only the window's direct children are listed up front; deeper
+        # levels are read from the widget hierarchy as the user expands them
+        self.setUpdatesEnabled(False)
+        try:
+            self.widget_model.set_root(window)
+            if window is not None:
+                self.expand(self.widget_model.index_for_widget(window))
+        finally:
+            self.setUpdatesEnabled(True)
+
+    def clear(self):
+        self.widget_model.set_root(None)
+
+    def refresh_widget(self, widget):
+        """Update the label of a single widget's row without rebuilding the tree"""
+        self.widget_model.refresh_widget(widget)
+
+    def on_current_changed(self, current, previous):
+        widget = self.widget_model.widget_for_index(current)
+        if widget is not None and not sip.isdeleted(widget):
             self.element_selected.emit(widget)
 
 
 class HotReloader(QtCore.QObject):
     reload_signal = QtCore.pyqtSignal()
+    window_reloaded = QtCore.pyqtSignal(QtWidgets.QWidget)
+
+    reload_delay = 150  # Milliseconds of quiet before reloading
 
     def __init__(self, module_path):
         super().__init__()
@@ -111,31 +260,99 @@ class HotReloader(QtCore.QObject):
         self.module = None
         self.main_window = None
 
-        # Set up file watcher
-        self.observer = Observer()
-        self.event_handler = FileChangeHandler(self)
-        self.observer.schedule(self.event_handler, str(Path(module_path).parent), recursive=False)
-        self.observer.start()
+        self._module_name = Path(module_path).stem
+        # Modules the first load added to sys.modules under our name; None until then
+        self._owned_modules = None
+
+        # Coalesce bursts of file events into a single trailing reload
+        self._reload_timer = QtCore.QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(self.reload_delay)
+        self._reload_timer.timeout.connect(self.on_reload_timeout)
+
+        # Set up file watcher; the directory is watched too so the file is
+        # picked up again if it disappears for a while (delete-then-write, git checkout)
+        self._target_path = str(Path(module_path).resolve())
+        self._fs_watcher = QtCore.QFileSystemWatcher([self._target_path, str(Path(self._target_path).parent)], self)
+        self._fs_watcher.fileChanged.connect(self.on_file_changed)
+        self._fs_watcher.directoryChanged.connect(self.on_directory_changed)
+
+        # Reloads requested while one is running collapse into one trailing reload
+        self._reload_mutex = QtCore.QMutex()
+        self._reload_running = False
+        self._reload_pending = False
 
         # Connect reload signal
-        self.reload_signal.connect(self.reload_ui)
+        self.reload_signal.connect(self.reload_ui, QtCore.Qt.ConnectionType.QueuedConnection)
 
         # Initial load
         self.load_module()
         self.create_window()
 
+    def stop(self):
+        self._reload_timer.stop()
+        watched_paths = self._fs_watcher.files() + self._fs_watcher.directories()
+        if watched_paths:
+            self._fs_watcher.removePaths(watched_paths)
+
+    def watch_target(self):
+        """Re-add the target if a save replaced or removed it; True when it was re-added"""
+        if self._target_path not in self._fs_watcher.files() and os.path.exists(self._target_path):
+            return self._fs_watcher.addPath(self._target_path)
+        return False
+
+    def on_file_changed(self, path):
+        print(f"Detected change in {path}, reloading...")
+        self.watch_target()
+        self._reload_timer.start()
+
+    def on_directory_changed(self, path):
+        # Sibling files change the directory too; only react when the target came back
+        if self.watch_target():
+            print(f"Detected {self._target_path} again, reloading...")
+            self._reload_timer.start()
+
+    def on_reload_timeout(self):
+        self.watch_target()
+        # Still missing mid-save; the directory watch restarts the timer once it reappears
+        if not os.path.exists(self._target_path):
+            return
+        self.reload_signal.emit()
+
     def load_module(self):
         try:
             # Remove module and its dependencies from cache
-            module_name = Path(self.module_path).stem
-            to_remove = [name for name in sys.modules if name.startswith(module_name)]
-            for name in to_remove:
-                del sys.modules[name]
-
-            # Import module
-            spec = importlib.util.spec_from_file_location(module_name, self.module_path)
-            self.module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(self.module)
+            module_name = self._module_name
+            sys.modules.pop(module_name, None)
+            if self._owned_modules is None:
+                modules_before = set(sys.modules)
+            else:
+                for name in self._owned_modules:
+                    sys.modules.pop(name, None)
+
+            # Execute the cached code in a fresh module, bypassing the import system
+            code = _compile_module(self._target_path)
+            module = types.ModuleType(module_name)
+            module.__file__ = self._target_path
+            module.__spec__ = importlib.machinery.ModuleSpec(module_name, None, origin=self._target_path)
+            sys.modules[module_name] = module
+
+            # Serve unchanged .ui files from the cache while the module runs
+            uic.loadUiType = _cached_load_ui_type
+            try:
+                exec(code, module.__dict__)
+            except Exception:
+                sys.modules.pop(module_name, None)
+                raise
+            finally:
+                uic.loadUiType = _original_load_ui_type
+            self.module = module
+
+            if self._owned_modules is None:
+                # Remember what this load pulled in so later reloads need not scan sys.modules
+                submodule_prefix = module_name + "."
+                self._owned_modules = {name for name in sys.modules.keys() - modules_before
+                                       if name == module_name or name.startswith(submodule_prefix)}
             return True
         except Exception as e:
             print(f"Error loading module: {e}")
@@ -147,43 +364,57 @@ class HotReloader(QtCore.QObject):
             self.main_window.show()
 
     def reload_ui(self):
+        self._reload_mutex.lock()
+        if self._reload_running:
+            self._reload_pending = True
+            self._reload_mutex.unlock()
+            return
+        self._reload_running = True
+        self._reload_mutex.unlock()
+
+        QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.CursorShape.WaitCursor)
         try:
             # Store current window geometry
             old_geometry = None
             if self.main_window:
                 old_geometry = self.main_window.geometry()
+                self.main_window.setUpdatesEnabled(False)
                 self.main_window.close()
                 self.main_window.deleteLater()
+                self.main_window = None
 
             # Create new window
             if self.load_module():
                 self.main_window = self.module.MainWindow()
 
-                # Restore geometry
+                # Apply geometry while painting is frozen so the window paints once
+                self.main_window.setUpdatesEnabled(False)
                 if old_geometry:
                     self.main_window.setGeometry(old_geometry)
+                self.main_window.setUpdatesEnabled(True)
 
                 self.main_window.show()
+                self.window_reloaded.emit(self.main_window)
                 print("UI reloaded successfully")
         except Exception as e:
             print(f"Error reloading UI: {e}")
             import traceback
             traceback.print_exc()
+        finally:
+            QtWidgets.QApplication.restoreOverrideCursor()
 
+            # The old window is gone even when the new one failed to load,
+            # so listeners must drop their references to it
+            if self.main_window is None:
+                self.window_reloaded.emit(None)
 
-class FileChangeHandler(FileSystemEventHandler):
-    def __init__(self, reloader):
-        self.reloader = reloader
-        self.last_reload_time = 0
-        self.reload_delay = 0.5  # Seconds
-
-    def on_modified(self, event):
-        current_time = time.time()
-        if (event.src_path == str(Path(self.reloader.module_path).absolute()) and
-                current_time - self.last_reload_time > self.reload_delay):
-            self.last_reload_time = current_time
-            print(f"Detected change in {event.src_path}, reloading...")
-            self.reloader.reload_signal.emit()
+            self._reload_mutex.lock()
+            self._reload_running = False
+            reload_again = self._reload_pending
+            self._reload_pending = False
+            self._reload_mutex.unlock()
+            if reload_again:
+                self.reload_signal.emit()
 
 
 def start_hot_reload(python_file):
@@ -193,7 +424,7 @@ def start_hot_reload(python_file):
 
 
 def main():
-    from .venv_utils import setup_environment, install_dependencies_in_venv
+    from .venv_utils import setup_environment, install_dependencies_in_venv, is_venv_ready, mark_venv_ready
     if len(sys.argv) != 2:
         print("Usage: pyqt-hot-reload <path_to_ui_file.py>")
         sys.exit(1)
@@ -209,12 +440,14 @@ def main():
         sys.exit(1)
 
     # Check and install dependencies in venv if needed
-    missing_packages = check_dependencies()
-    if missing_packages:
-        print("Installing missing dependencies in virtual environment...")
-        if not install_dependencies_in_venv(python_path, missing_packages):
-            print("Failed to install dependencies")
-            sys.exit(1)
+    if not is_venv_ready(python_path):
+        missing_packages = check_dependencies_in_venv(python_path)
+        if missing_packages:
+            print("Installing missing dependencies in virtual environment...")
+            if not install_dependencies_in_venv(python_path, missing_packages):
+                print("Failed to install dependencies")
+                sys.exit(1)
+        mark_venv_ready(python_path)
 
     # Start the hot reload
     start_hot_reload(str(ui_file))
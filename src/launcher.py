@@ -1,21 +1,135 @@
+import codecs
+import enum
+import re
 import sys
 from pathlib import Path
 
-from PyQt6 import QtWidgets
+from PyQt6 import QtWidgets, QtCore, sip
 from PyQt6.QtCore import Qt, QSize
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QHBoxLayout, QPushButton, QLineEdit, QFileDialog,
                              QLabel, QMessageBox, QSplitter)
 
 from src.hot_reload import HotReloader, ElementTree
-from src.utils import check_dependencies
-from src.venv_utils import setup_environment, install_dependencies_in_venv
+from src.utils import check_dependencies_in_venv
+from src.venv_utils import setup_environment, is_venv_ready, mark_venv_ready
+
+
+# Values longer than this are shortened in the table and shown in full when edited
+_MAX_DISPLAY_LENGTH = 200
+# Item data role holding a property's full, untruncated text
+_FULL_VALUE_ROLE = Qt.ItemDataRole.UserRole.value + 1
+
+# Parses the geometry string shown in the property table (x:10, y:20, w:100, h:30)
+_GEOMETRY_RE = re.compile(r"x:(-?\d+), ?y:(-?\d+), ?w:(\d+), ?h:(\d+)")
+
+
+def _apply_geometry(widget, value):
+    match = _GEOMETRY_RE.fullmatch(value.strip())
+    if not match:
+        raise ValueError(f"expected 'x:<int>, y:<int>, w:<int>, h:<int>', got {value!r}")
+    widget.setGeometry(*map(int, match.groups()))
+
+
+def _apply_text(widget, value):
+    if hasattr(widget, 'setText'):
+        widget.setText(value)
+
+
+def _apply_placeholder_text(widget, value):
+    if isinstance(widget, QtWidgets.QLineEdit):
+        widget.setPlaceholderText(value)
+
+
+def _apply_generic(widget, prop_name, value):
+    # Convert the edited text back to the type the property currently holds
+    current = widget.property(prop_name)
+    if isinstance(current, bool):
+        new_value = value.lower() == "true"
+    elif type(current) in (int, float, str):
+        new_value = type(current)(value)
+    else:
+        raise ValueError(f"{type(current).__name__} values cannot be edited as text")
+
+    if not widget.setProperty(prop_name, new_value):
+        raise ValueError(f"{widget.__class__.__name__} rejected the value {value!r}")
+
+
+# Property name -> setter; names not listed here go through _apply_generic
+_APPLIERS = {
+    "geometry": _apply_geometry,
+    "styleSheet": lambda widget, value: widget.setStyleSheet(value),
+    "text": _apply_text,
+    "enabled": lambda widget, value: widget.setEnabled(value.lower() == "true"),
+    "visible": lambda widget, value: widget.setVisible(value.lower() == "true"),
+    "objectName": lambda widget, value: widget.setObjectName(value),
+    "placeholderText": _apply_placeholder_text,
+}
+
+
+# Value types _apply_generic can turn edited text back into
+_TEXT_EDITABLE_TYPES = (bool, int, float, str)
+
+
+def _enum_keys(prop, value):
+    # Enum and flag properties may be read back as Python enums or as plain ints
+    raw_value = value.value if isinstance(value, enum.Enum) else int(value)
+    meta_enum = prop.enumerator()
+    keys = meta_enum.valueToKeys(raw_value) if prop.isFlagType() else meta_enum.valueToKey(raw_value)
+    if isinstance(keys, QtCore.QByteArray):
+        keys = bytes(keys).decode()
+    return keys or str(raw_value)
+
+
+def _format_property(prop, value):
+    if prop.isEnumType() or prop.isFlagType():
+        return _enum_keys(prop, value)
+    if isinstance(value, (QtCore.QRect, QtCore.QRectF)):
+        return f"x:{value.x()}, y:{value.y()}, w:{value.width()}, h:{value.height()}"
+    if isinstance(value, (QtCore.QSize, QtCore.QSizeF)):
+        return f"w:{value.width()}, h:{value.height()}"
+    if isinstance(value, (QtCore.QPoint, QtCore.QPointF)):
+        return f"x:{value.x()}, y:{value.y()}"
+    if value is None:
+        return ""
+    if isinstance(value, _TEXT_EDITABLE_TYPES):
+        return str(value)
+    # Palettes, fonts, cursors, ... have no useful text form
+    return f"<{type(value).__name__}>"
+
+
+def _is_editable(prop, value):
+    if not prop.isWritable():
+        return False
+    if prop.name() in _APPLIERS:
+        return True
+    return isinstance(value, _TEXT_EDITABLE_TYPES) and not (prop.isEnumType() or prop.isFlagType())
+
+
+class PropertyValueDelegate(QtWidgets.QStyledItemDelegate):
+    """Edits the full property value even when the cell shows a shortened one"""
+
+    def setEditorData(self, editor, index):
+        full_value = index.data(_FULL_VALUE_ROLE)
+        if full_value is not None and isinstance(editor, QtWidgets.QLineEdit):
+            editor.setText(full_value)
+        else:
+            super().setEditorData(editor, index)
+
+    def setModelData(self, editor, model, index):
+        if isinstance(editor, QtWidgets.QLineEdit):
+            model.setData(index, editor.text(), _FULL_VALUE_ROLE)
+        super().setModelData(editor, model, index)
 
 
 class PropertyEditor(QtWidgets.QWidget):
+    widget_renamed = QtCore.pyqtSignal(QtWidgets.QWidget)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.current_widget = None
+        self._row_pool = []  # (name_item, value_item) pairs reused across selections
+        self._edited_rows = set()
         self.setup_ui()
 
     def setup_ui(self):
@@ -56,6 +170,7 @@ class PropertyEditor(QtWidgets.QWidget):
         self.property_table.horizontalHeader().setSectionResizeMode(1, QtWidgets.QHeaderView.ResizeMode.Stretch)
         self.property_table.verticalHeader().setVisible(False)
         self.property_table.setAlternatingRowColors(True)
+        self.property_table.setItemDelegateForColumn(1, PropertyValueDelegate(self.property_table))
         layout.addWidget(self.property_table)
 
         # Apply button
@@ -120,107 +235,226 @@ class PropertyEditor(QtWidgets.QWidget):
 
     def on_property_changed(self, item):
         if item.column() == 1:  # Only enable button when values are changed
+            self._edited_rows.add(item.row())
             self.apply_button.setEnabled(True)
 
     def update_properties(self, widget):
         self.current_widget = widget
-        self.property_table.setRowCount(0)
         self.apply_button.setEnabled(False)
 
         if not widget:
             self.widget_info.setText("No widget selected")
+            self.fill_table({})
             return
 
         # Update widget info
         self.widget_info.setText(f"Selected: {widget.__class__.__name__} ({widget.objectName() or 'Unnamed'})")
 
-        # Get widget properties
-        properties = {
-            "objectName": (widget.objectName(), "str"),
-            "geometry": (f"x:{widget.x()}, y:{widget.y()}, w:{widget.width()}, h:{widget.height()}", "geometry"),
-            "visible": (widget.isVisible(), "bool"),
-            "enabled": (widget.isEnabled(), "bool"),
-            "styleSheet": (widget.styleSheet(), "str"),
-        }
-
-        # Add specific properties based on widget type
-        if isinstance(widget, QtWidgets.QLabel):
-            properties.update({
-                "text": (widget.text(), "str"),
-                "alignment": (str(widget.alignment()), "alignment"),
-            })
-        elif isinstance(widget, QtWidgets.QPushButton):
-            properties.update({
-                "text": (widget.text(), "str"),
-            })
-        elif isinstance(widget, QtWidgets.QLineEdit):
-            properties.update({
-                "text": (widget.text(), "str"),
-                "placeholderText": (widget.placeholderText(), "str"),
-            })
-
-        # Populate table
-        for prop_name, (value, prop_type) in properties.items():
-            row = self.property_table.rowCount()
-            self.property_table.insertRow(row)
-
-            # Property name
-            name_item = QtWidgets.QTableWidgetItem(prop_name)
-            name_item.setFlags(name_item.flags() & ~Qt.ItemFlag.ItemIsEditable)  # Make name non-editable
-            name_item.setToolTip(f"Type: {prop_type}")
-            self.property_table.setItem(row, 0, name_item)
-
-            # Property value
-            value_item = QtWidgets.QTableWidgetItem(str(value))
-            value_item.setData(Qt.ItemDataRole.UserRole, prop_type)  # Store property type
-            self.property_table.setItem(row, 1, value_item)
+        # Every readable, stored Qt property the widget's class declares
+        meta_object = widget.metaObject()
+        properties = {}
+        for index in range(meta_object.propertyCount()):
+            prop = meta_object.property(index)
+            if not (prop.isReadable() and prop.isStored()):
+                continue
+            try:
+                raw_value = prop.read(widget)
+                value = _format_property(prop, raw_value)
+                editable = _is_editable(prop, raw_value)
+            except Exception as e:
+                value = f"<unreadable: {e}>"
+                editable = False
+            properties[prop.name()] = (value, prop.typeName(), editable)
+
+        self.fill_table(properties)
+
+    def fill_table(self, properties):
+        table = self.property_table
+        row_count = len(properties)
+
+        self._edited_rows.clear()
+
+        # Refilling must not look like a user edit to on_property_changed
+        table.blockSignals(True)
+        try:
+            # Take surplus items back before shrinking so the table doesn't delete them
+            for row in range(row_count, table.rowCount()):
+                table.takeItem(row, 0)
+                table.takeItem(row, 1)
+
+            while len(self._row_pool) < row_count:
+                name_item = QtWidgets.QTableWidgetItem()
+                name_item.setFlags(name_item.flags() & ~Qt.ItemFlag.ItemIsEditable)  # Make name non-editable
+                self._row_pool.append((name_item, QtWidgets.QTableWidgetItem()))
+
+            table.setRowCount(row_count)
+            for row, (prop_name, (value, prop_type, editable)) in enumerate(properties.items()):
+                name_item, value_item = self._row_pool[row]
+
+                # Property name
+                name_item.setText(prop_name)
+                name_item.setToolTip(f"Type: {prop_type}")
+
+                # Property value; long values are shortened and expanded when edited
+                if len(value) > _MAX_DISPLAY_LENGTH:
+                    value_item.setText(value[:_MAX_DISPLAY_LENGTH] + "... (click to edit)")
+                else:
+                    value_item.setText(value)
+                value_item.setData(_FULL_VALUE_ROLE, value)
+                value_item.setData(Qt.ItemDataRole.UserRole, prop_type)  # Store property type
+                if editable:
+                    value_item.setFlags(value_item.flags() | Qt.ItemFlag.ItemIsEditable)
+                else:
+                    value_item.setFlags(value_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+
+                if table.item(row, 0) is not name_item:
+                    table.setItem(row, 0, name_item)
+                    table.setItem(row, 1, value_item)
+        finally:
+            table.blockSignals(False)
 
     def apply_changes(self):
         if not self.current_widget:
             return
 
-        for row in range(self.property_table.rowCount()):
+        # Only write back what the user edited; other properties may not round-trip through text
+        name_changed = False
+        for row in sorted(self._edited_rows):
             prop_name = self.property_table.item(row, 0).text()
-            value = self.property_table.item(row, 1).text()
-            prop_type = self.property_table.item(row, 1).data(Qt.ItemDataRole.UserRole)
+            value = self.property_table.item(row, 1).data(_FULL_VALUE_ROLE)
 
             try:
-                if prop_name == "geometry":
-                    # Parse geometry string (x:10, y:20, w:100, h:30)
-                    geo_dict = dict(item.split(':') for item in value.replace(' ', '').split(','))
-                    self.current_widget.setGeometry(
-                        int(geo_dict['x']),
-                        int(geo_dict['y']),
-                        int(geo_dict['w']),
-                        int(geo_dict['h'])
-                    )
-                elif prop_name == "styleSheet":
-                    self.current_widget.setStyleSheet(value)
-                elif prop_name == "text" and hasattr(self.current_widget, 'setText'):
-                    self.current_widget.setText(value)
-                elif prop_name == "enabled":
-                    self.current_widget.setEnabled(value.lower() == "true")
-                elif prop_name == "visible":
-                    self.current_widget.setVisible(value.lower() == "true")
-                elif prop_name == "objectName":
-                    self.current_widget.setObjectName(value)
-                elif prop_name == "placeholderText" and isinstance(self.current_widget, QtWidgets.QLineEdit):
-                    self.current_widget.setPlaceholderText(value)
+                if prop_name == "objectName":
+                    if value == self.current_widget.objectName():
+                        continue
+                    name_changed = True
+
+                applier = _APPLIERS.get(prop_name)
+                if applier is not None:
+                    applier(self.current_widget, value)
+                else:
+                    _apply_generic(self.current_widget, prop_name, value)
 
             except Exception as e:
                 print(f"Error applying property {prop_name}: {e}")
 
+        self._edited_rows.clear()
         self.apply_button.setEnabled(False)
 
-        # Update the tree to reflect any name changes
-        if isinstance(self.parent(), LauncherWindow):
-            self.parent().element_tree.populate_tree(self.parent().hot_reloader.main_window)
+        # Only the selected widget's label can change, so update it in place
+        if name_changed:
+            self.widget_renamed.emit(self.current_widget)
+
+
+class PipInstaller(QtCore.QObject):
+    """Runs pip install in a QProcess, reporting its latest line of output"""
+    output = QtCore.pyqtSignal(str)
+    finished = QtCore.pyqtSignal(int)  # pip's exit code, or -1 if it could not run
+
+    def __init__(self, python_path, packages, parent=None):
+        super().__init__(parent)
+        self.process = QtCore.QProcess(self)
+        self.process.setProgram(str(python_path))
+        self.process.setArguments(["-m", "pip", "install", "--progress-bar", "off", "-v"] + list(packages))
+        self.process.setProcessChannelMode(QtCore.QProcess.ProcessChannelMode.MergedChannels)
+        self.process.readyReadStandardOutput.connect(self.on_ready_read)
+
+        # Output arrives in arbitrary chunks; hold back any incomplete trailing line
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._partial_line = ""
+
+    def on_ready_read(self):
+        output = self._partial_line + self._decoder.decode(bytes(self.process.readAllStandardOutput()))
+        complete, _, self._partial_line = output.rpartition("\n")
+        self.emit_last_line(complete)
+
+    def emit_last_line(self, text):
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        if lines:
+            self.output.emit(lines[-1])
+
+    def kill(self):
+        """Abort a running install; call from the thread that called run()"""
+        if self.process.state() != QtCore.QProcess.ProcessState.NotRunning:
+            self.process.kill()
+
+    def run(self):
+        """Start pip and block until it exits; output is emitted while waiting"""
+        self.process.start()
+        if not self.process.waitForStarted():
+            self.finished.emit(-1)
+            return -1
+
+        # waitForFinished delivers readyRead signals on this thread as output arrives
+        thread = QtCore.QThread.currentThread()
+        while self.process.state() != QtCore.QProcess.ProcessState.NotRunning:
+            if thread.isInterruptionRequested():
+                self.kill()
+            self.process.waitForFinished(100)
+        self.emit_last_line(self._partial_line + self._decoder.decode(b"", final=True))
+        self._partial_line = ""
+
+        if self.process.exitStatus() == QtCore.QProcess.ExitStatus.NormalExit:
+            exit_code = self.process.exitCode()
+        else:
+            exit_code = -1
+        self.finished.emit(exit_code)
+        return exit_code
+
+
+class EnvSetupWorker(QtCore.QThread):
+    """Creates the project's virtual environment and installs missing dependencies"""
+    progress = QtCore.pyqtSignal(str)
+    setup_finished = QtCore.pyqtSignal(object)  # venv python path, or None on failure
+
+    def __init__(self, project_dir, parent=None):
+        super().__init__(parent)
+        self.project_dir = project_dir
+        self.error = None
+
+    def run(self):
+        try:
+            self.progress.emit("Setting up virtual environment...")
+            python_path = setup_environment(self.project_dir)
+            if not python_path:
+                self.fail("Failed to setup virtual environment")
+                return
+            if self.isInterruptionRequested():
+                self.fail("Environment setup cancelled")
+                return
+
+            if not is_venv_ready(python_path):
+                self.progress.emit("Checking dependencies...")
+                missing_packages = check_dependencies_in_venv(python_path)
+                if missing_packages and not self.isInterruptionRequested():
+                    self.progress.emit("Installing dependencies...")
+                    installer = PipInstaller(python_path, missing_packages)
+                    installer.output.connect(self.progress.emit)
+                    if installer.run() != 0:
+                        self.fail("Failed to install dependencies")
+                        return
+                if self.isInterruptionRequested():
+                    self.fail("Environment setup cancelled")
+                    return
+                mark_venv_ready(python_path)
+
+            self.setup_finished.emit(str(python_path))
+        except Exception as e:
+            self.fail(f"Failed to start hot reload: {str(e)}")
+
+    def fail(self, message):
+        self.error = message
+        self.setup_finished.emit(None)
 
 
 class LauncherWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.hot_reloader = None
+        self.env_worker = None
+        self.pending_file_path = None
+        self.closing = False
+        self.cancelled_worker = None
         self.setup_ui()
 
     def setup_ui(self):
@@ -277,7 +511,7 @@ class LauncherWindow(QMainWindow):
         main_layout.addWidget(self.status_label)
 
         # Create inspector area
-        inspector_splitter = QSplitter(Qt.Orientation.Horizontal)
+        self.inspector_splitter = inspector_splitter = QSplitter(Qt.Orientation.Horizontal)
 
         # Element Tree
         self.element_tree = ElementTree()
@@ -289,6 +523,7 @@ class LauncherWindow(QMainWindow):
 
         # Connect signals
         self.element_tree.element_selected.connect(self.property_editor.update_properties)
+        self.property_editor.widget_renamed.connect(self.element_tree.refresh_widget)
 
         # Set initial splitter sizes
         inspector_splitter.setSizes([400, 600])
@@ -353,24 +588,24 @@ class LauncherWindow(QMainWindow):
             QPushButton#toggle_button_stop:hover {
                 background-color: #c0392b;
             }
-            QTreeWidget {
+            QTreeView {
                 border: 1px solid #ddd;
                 border-radius: 4px;
                 background-color: white;
                 padding: 8px;
             }
-            QTreeWidget::item {
+            QTreeView::item {
                 padding: 6px;
                 border-radius: 2px;
             }
-            QTreeWidget::item:hover {
+            QTreeView::item:hover {
                 background-color: #f0f0f0;
             }
-            QTreeWidget::item:selected {
+            QTreeView::item:selected {
                 background-color: #4a90e2;
                 color: white;
             }
-            QTreeWidget::branch {
+            QTreeView::branch {
                 background-color: white;
             }
             QSplitter::handle {
@@ -403,23 +638,33 @@ class LauncherWindow(QMainWindow):
             QMessageBox.warning(self, "Error", "Selected file does not exist")
             return
 
-        try:
-            # Setup virtual environment
-            python_path = setup_environment(Path(file_path).parent)
-            if not python_path:
-                QMessageBox.critical(self, "Error", "Failed to setup virtual environment")
-                return
+        # Prepare the virtual environment in the background, then start reloading
+        self.pending_file_path = file_path
+        self.toggle_button.setEnabled(False)
+        self.env_worker = EnvSetupWorker(Path(file_path).parent, self)
+        self.env_worker.progress.connect(self.status_label.setText)
+        self.env_worker.setup_finished.connect(self.on_environment_ready)
+        self.env_worker.finished.connect(self.env_worker.deleteLater)
+        self.env_worker.start()
+
+    def on_environment_ready(self, python_path):
+        # A result queued before the launcher closed must not open the user's window
+        if self.closing or self.env_worker is None:
+            return
 
-            # Check and install dependencies
-            missing_packages = check_dependencies()
-            if missing_packages:
-                self.status_label.setText("Installing dependencies...")
-                if not install_dependencies_in_venv(python_path, missing_packages):
-                    QMessageBox.critical(self, "Error", "Failed to install dependencies")
-                    return
+        error = self.env_worker.error
+        self.env_worker = None
+        self.toggle_button.setEnabled(True)
+
+        if not python_path:
+            QMessageBox.critical(self, "Error", error)
+            self.status_label.setText("Error occurred")
+            return
 
+        try:
             self.status_label.setText("Starting hot reload...")
-            self.hot_reloader = HotReloader(file_path)
+            self.hot_reloader = HotReloader(self.pending_file_path)
+            self.hot_reloader.window_reloaded.connect(self.on_window_reloaded)
 
             # Update the element tree with the new window
             if self.hot_reloader.main_window:
@@ -435,11 +680,20 @@ class LauncherWindow(QMainWindow):
             QMessageBox.critical(self, "Error", f"Failed to start hot reload: {str(e)}")
             self.status_label.setText("Error occurred")
 
+    def on_window_reloaded(self, window):
+        # The previous window's widgets are gone, so rebuild the inspector in one paint;
+        # window is None when the reload failed, which leaves the inspector empty
+        self.inspector_splitter.setUpdatesEnabled(False)
+        try:
+            self.property_editor.update_properties(None)
+            self.element_tree.populate_tree(window)
+        finally:
+            self.inspector_splitter.setUpdatesEnabled(True)
+
     def stop_hot_reload(self):
         if self.hot_reloader:
             try:
-                self.hot_reloader.observer.stop()
-                self.hot_reloader.observer.join()
+                self.hot_reloader.stop()
                 if self.hot_reloader.main_window:
                     self.hot_reloader.main_window.close()
                 self.hot_reloader = None
@@ -467,7 +721,23 @@ class LauncherWindow(QMainWindow):
         if file_path:
             self.path_input.setText(file_path)
 
+    def finish_cancelled_setup(self):
+        # Venv creation can't be interrupted, so let it end before the thread object is destroyed;
+        # by now the launcher is already closed, so this doesn't block a visible window
+        worker = self.cancelled_worker
+        if worker is not None and not sip.isdeleted(worker):
+            worker.wait()
+
     def closeEvent(self, event):
+        self.closing = True
+        if self.env_worker is not None:
+            # Cancel setup (this kills a running pip) and ignore its result
+            worker = self.env_worker
+            self.env_worker = None
+            worker.setup_finished.disconnect(self.on_environment_ready)
+            worker.requestInterruption()
+            self.cancelled_worker = worker
+            QApplication.instance().aboutToQuit.connect(self.finish_cancelled_setup)
         self.stop_hot_reload()
         event.accept()
 
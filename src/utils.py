@@ -1,28 +1,117 @@
+import hashlib
+import json
+import re
 import sys
-import importlib
 import subprocess
+from importlib import metadata
+from pathlib import Path
 
 
-def check_dependencies():
-    required_packages = {
-        'PyQt6': 'PyQt6>=6.0.0',
-        'watchdog': 'watchdog>=2.1.0'
-    }
+def _version_tuple(version):
+    """Numeric release segment of a version string, e.g. '6.8.1.dev0' -> (6, 8, 1)
+
+    Trailing zeros are dropped so that '6.0' and '6.0.0' compare equal.
+    """
+    release = re.match(r"\d+(?:\.\d+)*", version)
+    parts = [int(part) for part in release.group().split('.')] if release else []
+    while parts and parts[-1] == 0:
+        parts.pop()
+    return tuple(parts)
+
+
+REQUIRED_PACKAGES = {
+    'PyQt6': 'PyQt6>=6.0.0',
+}
+
+# Run inside the target interpreter; prints {distribution: version or null} as JSON
+_VERSION_PROBE = """
+import json, sys
+from importlib import metadata
+versions = {}
+for name in sys.argv[1:]:
+    try:
+        versions[name] = metadata.distribution(name).version
+    except metadata.PackageNotFoundError:
+        versions[name] = None
+print(json.dumps(versions))
+"""
+
+# Results of check_dependencies_in_venv, keyed by (python_path, site-packages mtime)
+_VENV_CHECK_CACHE = {}
 
+
+def _missing_requirements(installed_versions):
     missing_packages = []
 
-    for package, requirement in required_packages.items():
-        try:
-            importlib.import_module(package)
-        except ImportError:
+    for package, requirement in REQUIRED_PACKAGES.items():
+        installed_version = installed_versions.get(package)
+        if installed_version is None:
+            missing_packages.append(requirement)
+            continue
+
+        minimum_version = requirement.partition('>=')[2]
+        if _version_tuple(installed_version) < _version_tuple(minimum_version):
             missing_packages.append(requirement)
 
     return missing_packages
 
 
+def check_dependencies():
+    installed_versions = {}
+    for package in REQUIRED_PACKAGES:
+        # Read the installed distribution's metadata instead of importing it
+        try:
+            installed_versions[package] = metadata.distribution(package).version
+        except metadata.PackageNotFoundError:
+            installed_versions[package] = None
+
+    return _missing_requirements(installed_versions)
+
+
+def _site_packages_mtime(python_path):
+    """Latest mtime of the venv's site-packages, which changes whenever pip installs into it"""
+    venv_dir = Path(python_path).parent.parent
+    candidates = list(venv_dir.glob('lib/python*/site-packages')) + [venv_dir / 'Lib' / 'site-packages']
+    mtimes = [path.stat().st_mtime for path in candidates if path.is_dir()]
+    return max(mtimes) if mtimes else None
+
+
+def get_venv_package_versions(python_path):
+    """Installed versions of the required packages for the interpreter at python_path, or None on failure"""
+    result = subprocess.run([str(python_path), '-c', _VERSION_PROBE] + list(REQUIRED_PACKAGES),
+                            capture_output=True, text=True)
+    try:
+        return json.loads(result.stdout)
+    except ValueError:
+        print(f"Error checking dependencies in {python_path}: {result.stderr.strip()}")
+        return None
+
+
+def check_dependencies_in_venv(python_path):
+    """Like check_dependencies, but for the interpreter at python_path"""
+    python_path = str(python_path)
+    cache_key = (python_path, _site_packages_mtime(python_path))
+    if cache_key[1] is not None and cache_key in _VENV_CHECK_CACHE:
+        return list(_VENV_CHECK_CACHE[cache_key])
+
+    installed_versions = get_venv_package_versions(python_path)
+    if installed_versions is None:
+        return list(REQUIRED_PACKAGES.values())
+
+    missing_packages = _missing_requirements(installed_versions)
+    if cache_key[1] is not None:
+        _VENV_CHECK_CACHE[cache_key] = missing_packages
+    return list(missing_packages)
+
+
+def requirements_hash():
+    """Fingerprint of REQUIRED_PACKAGES, so markers written for older requirements are ignored"""
+    return hashlib.sha256(json.dumps(REQUIRED_PACKAGES, sort_keys=True).encode()).hexdigest()
+
+
 def install_dependencies(packages):
     try:
         subprocess.check_call([sys.executable, '-m', 'pip', 'install'] + packages)
         return True
     except subprocess.CalledProcessError:
-        return False
\ No newline at end of file
+        return False
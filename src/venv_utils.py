@@ -1,9 +1,13 @@
+import json
 import subprocess
 import sys
 import venv
 from pathlib import Path
 
-from src.utils import check_dependencies
+from src.utils import check_dependencies_in_venv, get_venv_package_versions, requirements_hash
+
+# Written into the venv once its dependencies are known to be installed
+READY_MARKER_NAME = ".hotreload_ready"
 
 
 def create_venv(base_dir):
@@ -35,7 +39,7 @@ def setup_environment(project_dir):
 
     # If we're already in the correct venv, no need to do anything
     if is_venv_active() and Path(sys.prefix) == venv_path:
-        return True
+        return sys.executable
 
     if not venv_path.exists():
         venv_path = create_venv(project_dir)
@@ -48,6 +52,32 @@ def setup_environment(project_dir):
     return str(python_path)
 
 
+def get_ready_marker(python_path):
+    """Path of the ready marker for the venv that owns python_path"""
+    return Path(python_path).parent.parent / READY_MARKER_NAME
+
+
+def is_venv_ready(python_path):
+    """Check whether the venv was marked ready for the current requirements"""
+    try:
+        marker = json.loads(get_ready_marker(python_path).read_text())
+    except (OSError, ValueError):
+        return False
+    return isinstance(marker, dict) and marker.get("requirements") == requirements_hash()
+
+
+def mark_venv_ready(python_path):
+    """Record that the venv has all required packages, so later runs skip the dependency check"""
+    installed_versions = get_venv_package_versions(python_path)
+    if installed_versions is None:
+        return
+    marker = {"requirements": requirements_hash(), "installed": installed_versions}
+    try:
+        get_ready_marker(python_path).write_text(json.dumps(marker, indent=2))
+    except OSError as e:
+        print(f"Could not write venv ready marker: {e}")
+
+
 def install_dependencies_in_venv(python_path, packages):
     """Install dependencies in the virtual environment"""
     try:
@@ -86,14 +116,16 @@ def main():
         print("Failed to set up virtual environment")
         sys.exit(1)
 
-    # Check and install dependencies
-    missing_packages = check_dependencies()
+    # Check and install dependencies, unless a previous run already did
+    if not is_venv_ready(python_path):
+        missing_packages = check_dependencies_in_venv(python_path)
 
-    if missing_packages:
-        print("Installing missing dependencies in virtual environment...")
-        if not install_dependencies_in_venv(python_path, missing_packages):
-            print("Failed to install dependencies")
-            sys.exit(1)
+        if missing_packages:
+            print("Installing missing dependencies in virtual environment...")
+            if not install_dependencies_in_venv(python_path, missing_packages):
+                print("Failed to install dependencies")
+                sys.exit(1)
+        mark_venv_ready(python_path)
 
     # Run the hot reload script in the virtual environment
     if not run_in_venv(python_path, ui_file):